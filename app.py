@@ -1,11 +1,14 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import json
 import io
+import re
+import time
 import base64
 import altair as alt
 from datetime import datetime, date, timedelta, timezone
-from github import Github, Auth
+from github import Github, Auth, InputGitTreeElement, UnknownObjectException
 from groq import Groq
 from fpdf import FPDF
 from PIL import Image
@@ -40,10 +43,15 @@ g = Github(auth=auth)
 repo = g.get_repo(GITHUB_REPO)
 
 # --- FUNÇÕES DE DADOS ---
+def ler_arquivo_repo(caminho):
+    """Conteúdo bruto de um arquivo do repo; acima de 1 MB a Contents API não traz o conteúdo, então lê o blob"""
+    contents = repo.get_contents(caminho)
+    if contents.encoding == "none": return base64.b64decode(repo.get_git_blob(contents.sha).content)
+    return contents.decoded_content
+
 def load_data():
     try:
-        contents = repo.get_contents("data_2026.json")
-        data = json.loads(contents.decoded_content.decode())
+        data = json.loads(ler_arquivo_repo("data_2026.json").decode())
         if "xp" not in data: data["xp"] = 0
         if "config" not in data: data["config"] = {}
         
@@ -73,7 +81,7 @@ def load_data():
         if "configuracoes" not in data:
              data["configuracoes"] = {"opcoes_eu_fiz": ["Elogio", "Tempo de Qualidade"], "opcoes_ela_fez": ["Carinho"]}
         return data
-    except:
+    except UnknownObjectException:
         return {
             "registros": {}, "eventos": {}, "acordos_mestres": [], "xp": 0,
             "metas": {"elogios": 3, "qualidade": 2, "intimidade": 2, "gratidao": 4, "paz": 7},
@@ -86,13 +94,17 @@ def load_data():
                 "nomes_casal": "Jhonata & Katheryn"
             }
         }
+    except Exception as e:
+        # Nunca cair no DB vazio aqui: o próximo save_all sobrescreveria o diário
+        st.error(f"Erro ao carregar data_2026.json: {e}")
+        st.stop()
 
 def save_all(data):
     json_data = json.dumps(data, indent=4, ensure_ascii=False)
     try:
         contents = repo.get_contents("data_2026.json")
         repo.update_file(contents.path, f"Sync {get_agora()}", json_data, contents.sha)
-    except:
+    except UnknownObjectException:
         repo.create_file("data_2026.json", "DB Init", json_data)
 
 db = load_data()
@@ -314,7 +326,262 @@ def ver_memoria(data, info):
     """, unsafe_allow_html=True)
     st.markdown(f"**📝 Resumo:**\n\n{info.get('resumo', 'Sem resumo.')}")
     if info.get('gratidao'): st.info(f"✨ **Gratidão:** {info['gratidao']}")
-    if info.get('whatsapp_txt'): st.text_area("WhatsApp:", info['whatsapp_txt'], disabled=True)
+    try: zap_importado = carregar_whatsapp_mes(data[:7]).get(data)
+    except Exception:
+        zap_importado = None; st.caption("Não foi possível carregar a conversa importada agora.")
+    zap = "\n".join(filter(None, [info.get('whatsapp_txt'), zap_importado]))
+    if zap: st.text_area("WhatsApp:", zap, disabled=True)
+
+# --- IMPORTAÇÃO WHATSAPP ---
+# Conversas ficam em whatsapp/AAAA-MM.json, fora do data_2026.json, e são carregadas sob demanda
+# Arquivos acima de 1 MB são lidos pelo blob (ler_arquivo_repo), que aceita até 100 MB
+PASTA_WHATSAPP = "whatsapp"
+CHECKPOINT_WHATSAPP_SEG = 60  # intervalo entre checkpoints gravados no repo durante a importação
+# Cobre Android ("12/01/2026 21:15 - Nome: msg"), iOS ("[12/01/26, 21:15:03] Nome: msg") e 12h ("9:05 PM")
+RE_WHATSAPP = re.compile(r"^\[?(\d{1,2})/(\d{1,2})/(\d{2,4}),?\s+(\d{1,2}):(\d{2})(?::(\d{2}))?\s*([AaPp]\.?\s?[Mm]\.?)?\]?\s*-?\s*(.*)$")
+
+def parse_linha_whatsapp(linha):
+    """Retorna (data, hora, texto) de uma linha do export ou None se for continuação de mensagem"""
+    m = RE_WHATSAPP.match(linha)
+    if not m: return None
+    dia, mes, ano, h, mi, s, ampm, texto = m.groups()
+    if len(ano) == 2: ano = "20" + ano
+    h = int(h)
+    if ampm: h = h % 12 + (12 if ampm[0] in "Pp" else 0)
+    try: date(int(ano), int(mes), int(dia))
+    except ValueError: return None
+    if h > 23 or int(mi) > 59 or int(s or 0) > 59: return None
+    return f"{ano}-{int(mes):02d}-{int(dia):02d}", f"{h:02d}:{mi}:{s or '00'}", texto
+
+def para_fuso_br(data, hora, fuso):
+    """Converte data/hora do fuso do celular que exportou (horas em relação a UTC) para FUSO_BR"""
+    if fuso == -3: return data, hora
+    dt = datetime.strptime(f"{data} {hora}", "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone(timedelta(hours=fuso))).astimezone(FUSO_BR)
+    return dt.strftime("%Y-%m-%d"), dt.strftime("%H:%M:%S")
+
+def ler_json_repo(caminho, padrao):
+    try: return json.loads(ler_arquivo_repo(caminho).decode())
+    except UnknownObjectException: return padrao
+
+@st.cache_data(show_spinner=False)
+def carregar_whatsapp_mes(mes):
+    """Conversas importadas de um mês ({data: texto})"""
+    return ler_json_repo(f"{PASTA_WHATSAPP}/{mes}.json", {})
+
+def novo_estado_whatsapp(nome, tamanho, fuso):
+    """Estado de importação; retoma do checkpoint salvo em whatsapp/importacoes.json se for o mesmo arquivo"""
+    reg = ler_json_repo(f"{PASTA_WHATSAPP}/importacoes.json", {}).get(nome, {})
+    estado = {"nome": nome, "tamanho": tamanho, "fuso": fuso, "offset": 0,
+              "anterior": {"ts": reg.get("ts", ""), "n": reg.get("n", 0)}, "marca": {"ts": "", "n": 0}, "nova": False,
+              "mes": None, "dias": {}, "novos": 0, "ultimo_dia": None, "blobs": {}, "dias_tocados": set(), "n_msgs": 0,
+              "checkpoint": False}
+    cp = reg.get("checkpoint")
+    if cp and (cp["tamanho"], cp["fuso"]) == (tamanho, fuso):
+        estado.update({k: cp[k] for k in ("offset", "marca", "nova", "ultimo_dia", "n_msgs")}, dias_tocados=set(cp["dias_tocados"]), checkpoint=True)
+        if estado["nova"] and estado["ultimo_dia"]: _abrir_mes_whatsapp(estado, estado["ultimo_dia"][:7])
+    elif cp:
+        # Outro export com o mesmo nome: o que o checkpoint já gravou vale como última importação
+        estado["anterior"] = max(estado["anterior"], cp["marca"], key=lambda m: (m["ts"], m["n"]))
+        estado["checkpoint"] = True
+    _snapshot_whatsapp(estado)
+    return estado
+
+def _copiar_estado_whatsapp(estado):
+    # Cópia só das partes mutáveis; as strings das mensagens são compartilhadas
+    cp = {k: v for k, v in estado.items() if k != "snapshot"}
+    cp.update(marca=dict(estado["marca"]), blobs=dict(estado["blobs"]), dias_tocados=set(estado["dias_tocados"]),
+              dias={d: list(l) for d, l in estado["dias"].items()})
+    return cp
+
+def _snapshot_whatsapp(estado):
+    estado["snapshot"] = _copiar_estado_whatsapp(estado)
+
+def restaurar_estado_whatsapp(estado):
+    """Volta ao último checkpoint consistente (offset, marca, blobs e mês em memória) após um erro"""
+    novo = _copiar_estado_whatsapp(estado["snapshot"])
+    novo["snapshot"] = estado["snapshot"]
+    return novo
+
+def _blob_mes_whatsapp(estado):
+    conteudo = json.dumps({d: "\n".join(l) for d, l in sorted(estado["dias"].items())}, indent=1, ensure_ascii=False)
+    return repo.create_git_blob(conteudo, "utf-8").sha
+
+def _fechar_mes_whatsapp(estado):
+    """Grava o mês em memória como blob (ainda sem commit) e libera o buffer"""
+    if estado["mes"] and estado["novos"]: estado["blobs"][estado["mes"]] = _blob_mes_whatsapp(estado)
+    estado["mes"], estado["dias"], estado["novos"] = None, {}, 0
+
+def _abrir_mes_whatsapp(estado, mes):
+    _fechar_mes_whatsapp(estado)
+    if mes in estado["blobs"]: dias = json.loads(base64.b64decode(repo.get_git_blob(estado["blobs"][mes]).content))
+    else: dias = ler_json_repo(f"{PASTA_WHATSAPP}/{mes}.json", {})
+    estado["mes"], estado["dias"] = mes, {d: [t] for d, t in dias.items()}
+
+def _gravar_whatsapp(estado, final):
+    """Um commit com os meses prontos e o índice: marca final ou, no meio da leitura, o checkpoint com o mês atual"""
+    if not final and estado["mes"] and estado["novos"]: estado["blobs"][estado["mes"]] = _blob_mes_whatsapp(estado)
+    indice = ler_json_repo(f"{PASTA_WHATSAPP}/importacoes.json", {})
+    if final: indice[estado["nome"]] = estado["marca"]
+    else:
+        indice[estado["nome"]] = {**estado["anterior"], "checkpoint": {
+            "tamanho": estado["tamanho"], "fuso": estado["fuso"], "offset": estado["offset"], "marca": estado["marca"],
+            "nova": estado["nova"], "ultimo_dia": estado["ultimo_dia"], "n_msgs": estado["n_msgs"],
+            "dias_tocados": sorted(estado["dias_tocados"])}}
+    arquivos = {f"{PASTA_WHATSAPP}/{mes}.json": sha for mes, sha in estado["blobs"].items()}
+    arquivos[f"{PASTA_WHATSAPP}/importacoes.json"] = repo.create_git_blob(json.dumps(indice, indent=4, ensure_ascii=False), "utf-8").sha
+    ramo = repo.get_git_ref(f"heads/{repo.default_branch}")
+    base = repo.get_git_commit(ramo.object.sha)
+    arvore = repo.create_git_tree([InputGitTreeElement(p, "100644", "blob", sha=sha) for p, sha in arquivos.items()], base.tree)
+    ramo.edit(repo.create_git_commit(f"WhatsApp {estado['nome']} {get_agora()}", arvore, [base]).sha)
+    estado["blobs"], estado["novos"], estado["checkpoint"] = {}, 0, not final
+    carregar_whatsapp_mes.clear()
+
+def importar_whatsapp(arquivo, estado, barra=None, lote=5000):
+    """Lê o export linha a linha e mescla as mensagens em whatsapp/AAAA-MM.json, agrupadas por dia em FUSO_BR.
+    Só um mês fica em memória; os meses prontos viram blobs e entram num commit no final, com checkpoints
+    gravados no repo a cada CHECKPOINT_WHATSAPP_SEG para retomar depois de recarregar a página."""
+    anterior = estado["anterior"]
+    arquivo.seek(estado["offset"])
+    n = 0
+    salvo_em = time.time()
+    for bruta in iter(arquivo.readline, b""):
+        linha = bruta.decode("utf-8", "replace").lstrip("\ufeff\u200e").rstrip("\r\n")
+        msg = parse_linha_whatsapp(linha)
+        if msg:
+            data, hora, texto = msg
+            ts = f"{data} {hora}"
+            if ts == estado["marca"]["ts"]: estado["marca"]["n"] += 1
+            else: estado["marca"] = {"ts": ts, "n": 1}
+            # Android só tem minutos: no minuto da última importação, conta as mensagens em vez de descartá-las
+            estado["nova"] = ts > anterior["ts"] or (ts == anterior["ts"] and estado["marca"]["n"] > anterior["n"])
+            if estado["nova"]:
+                data, hora = para_fuso_br(data, hora, estado["fuso"])
+                if data[:7] != estado["mes"]: _abrir_mes_whatsapp(estado, data[:7])
+                estado["dias"].setdefault(data, []).append(f"{hora[:5]} {texto}")
+                estado["ultimo_dia"] = data; estado["dias_tocados"].add(data)
+                estado["novos"] += 1; estado["n_msgs"] += 1
+        elif estado["nova"] and linha:
+            estado["dias"][estado["ultimo_dia"]].append(linha)
+        n += 1
+        if n % lote == 0:
+            # Fim de lote: o estado bate com o offset, então vira o ponto de retomada
+            estado["offset"] = arquivo.tell()
+            if time.time() - salvo_em >= CHECKPOINT_WHATSAPP_SEG:
+                _gravar_whatsapp(estado, final=False); salvo_em = time.time()
+            _snapshot_whatsapp(estado)
+            if barra: barra.progress(min(estado["offset"] / max(estado["tamanho"], 1), 1.0), text="Lendo export...")
+    estado["offset"] = arquivo.tell()
+    _fechar_mes_whatsapp(estado)
+
+    if estado["blobs"] or estado["checkpoint"]: _gravar_whatsapp(estado, final=True)
+    if barra: barra.progress(1.0, text="Importação concluída!")
+    return len(estado["dias_tocados"]), estado["n_msgs"]
+
+# --- ANÁLISE LOCAL DE TENDÊNCIAS ---
+DIAS_SEMANA = ["Seg", "Ter", "Qua", "Qui", "Sex", "Sáb", "Dom"]
+
+def montar_df_tendencias(registros):
+    """Monta um DataFrame diário ordenado com a nota e as flags (0/1) de cada registro"""
+    linhas = []
+    for d, r in registros:
+        if "nota" not in r: continue
+        linha = {"Data": datetime.strptime(d, "%Y-%m-%d"), "Nota": r["nota"],
+                 "Discussão": float(bool(r.get("discussao"))), "Intimidade": float(bool(r.get("sexo")))}
+        for c in CATEGORIAS_DR: linha[f"DR: {c}"] = float(r.get("cat_dr") == c)
+        for l in LINGUAGENS_LISTA: linha[l] = float(l in r.get("ling_eu", []) or l in r.get("ling_ela", []))
+        linhas.append(linha)
+    if not linhas: return pd.DataFrame()
+    return pd.DataFrame(linhas).sort_values("Data").reset_index(drop=True)
+
+def detectar_mudanca(notas, min_n=20, min_seg=5, penalidade=3):
+    """Ponto de mudança único por mínimos quadrados, aceito só se superar o critério penalizado (estilo BIC)"""
+    x = np.asarray(notas, dtype=float)
+    n = len(x)
+    if n < max(min_n, 2 * min_seg): return None
+    cs, cs2 = np.cumsum(x), np.cumsum(x ** 2)
+    k = np.arange(min_seg, n - min_seg + 1)
+    custo = (cs2[k - 1] - cs[k - 1] ** 2 / k) + ((cs2[-1] - cs2[k - 1]) - (cs[-1] - cs[k - 1]) ** 2 / (n - k))
+    total = cs2[-1] - cs[-1] ** 2 / n
+    i = int(np.argmin(custo))
+    if total <= 0: return None
+    # n*log(total/custo) > c*log(n): com c=3, ~3% de falsos positivos em n=20 e <1% em séries longas
+    if custo[i] > 0 and n * np.log(total / custo[i]) <= penalidade * np.log(n): return None
+    idx = int(k[i])
+    return idx, float(x[:idx].mean()), float(x[idx:].mean())
+
+def calcular_tendencias(registros, janela=7, min_por_dia=3, min_corr=14, min_flag=3):
+    """Médias móveis, efeito do dia da semana, ponto de mudança e correlações da nota com as flags.
+    Efeitos e correlações sem amostra mínima ficam vazios ("dados insuficientes")."""
+    df = montar_df_tendencias(registros)
+    if df.empty: return None
+    media = float(df["Nota"].mean())
+    # Janela em dias corridos, não em registros: dias sem diário não puxam notas antigas para a média
+    df["Média Móvel"] = df.rolling(f"{janela}D", on="Data")["Nota"].mean()
+
+    por_dia = df.groupby(df["Data"].dt.weekday)["Nota"].agg(["mean", "count"]).reindex(range(7))
+    sazonal = pd.DataFrame({"Dia": DIAS_SEMANA, "Efeito": por_dia["mean"].values - media})
+    if not (por_dia["count"] >= min_por_dia).all(): sazonal = sazonal.iloc[0:0]
+
+    corr = {}
+    if len(df) >= min_corr and df["Nota"].std() > 0:
+        for c in df.columns.drop(["Data", "Nota", "Média Móvel"]):
+            # A flag precisa aparecer (e faltar) em alguns dias para a correlação dizer algo
+            if min_flag <= df[c].sum() <= len(df) - min_flag: corr[c] = float(np.corrcoef(df[c], df["Nota"])[0, 1])
+    correl = pd.DataFrame({"Fator": list(corr.keys()), "Correlação": list(corr.values())}).sort_values("Correlação")
+
+    dias = (df["Data"] - df["Data"].iloc[0]).dt.days.to_numpy()
+    inclinacao = float(np.polyfit(dias, df["Nota"], 1)[0]) if len(df) > 1 else 0.0
+    mudanca = detectar_mudanca(df["Nota"])
+    if mudanca: mudanca = (df["Data"].iloc[mudanca[0]], mudanca[1], mudanca[2])
+    return {"df": df, "media": media, "inclinacao": inclinacao, "sazonal": sazonal, "correl": correl, "mudanca": mudanca}
+
+def resumo_tendencias(t):
+    """Texto compacto com os números calculados, usado como contexto da narrativa da IA"""
+    df = t["df"]
+    linhas = [f"{len(df)} dias de {df['Data'].iloc[0]:%d/%m/%Y} a {df['Data'].iloc[-1]:%d/%m/%Y}.",
+              f"Nota média {t['media']:.1f}; tendência {t['inclinacao'] * 7:+.2f} pontos por semana; média móvel atual {df['Média Móvel'].iloc[-1]:.1f}."]
+    if t["mudanca"]:
+        d, antes, depois = t["mudanca"]
+        linhas.append(f"Mudança de patamar em {d:%d/%m}: média {antes:.1f} antes, {depois:.1f} depois.")
+    if not t["sazonal"].empty:
+        linhas.append("Efeito do dia da semana: " + ", ".join(f"{r.Dia} {r.Efeito:+.1f}" for r in t["sazonal"].itertuples()) + ".")
+    if not t["correl"].empty:
+        linhas.append("Correlação com a nota: " + ", ".join(f"{f} {c:+.2f}" for f, c in zip(t["correl"]["Fator"], t["correl"]["Correlação"])) + ".")
+    return "\n".join(linhas)
+
+def render_tendencias(t):
+    df = t["df"]
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Nota Média", f"{t['media']:.1f}")
+    c2.metric("Tendência/Semana", f"{t['inclinacao'] * 7:+.2f}")
+    c3.metric("Média Móvel (7d)", f"{df['Média Móvel'].iloc[-1]:.1f}")
+
+    base = alt.Chart(df).encode(x=alt.X('Data', axis=alt.Axis(format='%d/%m')))
+    camadas = [base.mark_line(color="#999", opacity=0.5).encode(y=alt.Y('Nota', scale=alt.Scale(domain=[0, 10]))),
+               base.mark_line(color=paleta['primary'], strokeWidth=4).encode(y='Média Móvel')]
+    if t["mudanca"]:
+        camadas.append(alt.Chart(pd.DataFrame({"Data": [t["mudanca"][0]]})).mark_rule(strokeDash=[6, 4], color=paleta['text_muted']).encode(x='Data'))
+        st.caption(f"📍 Mudança de patamar em {t['mudanca'][0]:%d/%m}: {t['mudanca'][1]:.1f} → {t['mudanca'][2]:.1f}")
+    st.markdown("#### 📈 Nota e Média Móvel")
+    st.altair_chart(alt.layer(*camadas).properties(height=220).configure_view(strokeWidth=0), use_container_width=True)
+
+    st.markdown("#### 📅 Efeito do Dia da Semana")
+    if t["sazonal"].empty: st.caption("Dados insuficientes: são precisos ao menos 3 registros de cada dia da semana.")
+    else:
+        chart = alt.Chart(t["sazonal"]).mark_bar(cornerRadius=4).encode(
+            x=alt.X('Dia', sort=DIAS_SEMANA), y='Efeito',
+            color=alt.condition(alt.datum.Efeito >= 0, alt.value("#22c55e"), alt.value("#ef4444"))
+        ).properties(height=200).configure_view(strokeWidth=0)
+        st.altair_chart(chart, use_container_width=True)
+
+    st.markdown("#### 🔗 O que acompanha a nota")
+    if t["correl"].empty: st.caption("Dados insuficientes: são precisos 14 dias com nota e cada fator presente e ausente em ao menos 3 deles.")
+    else:
+        chart = alt.Chart(t["correl"]).mark_bar(cornerRadius=4).encode(
+            x=alt.X('Correlação', scale=alt.Scale(domain=[-1, 1])), y=alt.Y('Fator', sort='-x'),
+            color=alt.condition(alt.datum["Correlação"] >= 0, alt.value("#22c55e"), alt.value("#ef4444"))
+        ).properties(height=max(120, 24 * len(t["correl"]))).configure_view(strokeWidth=0)
+        st.altair_chart(chart, use_container_width=True)
 
 # --- HELPER PDF ---
 def gerar_pdf(dados_mes, nome_mes, img_bytes=None):
@@ -608,7 +875,21 @@ elif menu == "Insights IA":
             if not regs_conf: st.success("Sem conflitos! 🎉"); executar = False
         c_ia3, c_ia4 = st.columns(2)
         if c_ia3.button("💘 Guru Romântico"): prompt = "Sugira 3 ideias criativas de encontros."; executar = True
-        if c_ia4.button("🔮 Tendências"): prompt = "Analise a tendência das notas."; executar = True
+        if c_ia4.button("🔮 Tendências"): st.session_state["ver_tendencias"] = True
+        if prompt: st.session_state["ver_tendencias"] = False  # qualquer outra consultoria fecha o painel
+        if st.session_state.get("ver_tendencias") and registros_filtrados:
+            # Estatísticas calculadas localmente; a IA só recebe o resumo numérico, se pedido
+            tend = calcular_tendencias(registros_filtrados)
+            if not tend: st.info("Sem notas no período.")
+            else:
+                st.divider()
+                render_tendencias(tend)
+                if st.button("✍️ Narrativa da IA"):
+                    try:
+                        with st.spinner("Escrevendo..."):
+                            resp = client_groq.chat.completions.create(model=db["config"]["modelo_ia"], messages=[{"role":"user","content":f"Aja como um terapeuta. Explique em poucas frases estas tendências das notas do casal (0-10). Resumo: {resumo_tendencias(tend)}"}], temperature=0.7)
+                            st.success(resp.choices[0].message.content)
+                    except Exception as e: st.error(f"Erro: {e}")
         if executar and registros_filtrados:
             ctx = str(registros_filtrados)
             if len(ctx) > 15000: ctx = ctx[-15000:]
@@ -686,6 +967,29 @@ elif menu == "Configurações":
                 if ce3.button("Salvar", key="sv_ela"): db["configuracoes"]["opcoes_ela_fez"][opts_ela.index(sel_ela)] = ren_ela; save_all(db); st.rerun()
                 if ce4.button("Excluir", key="dl_ela"): db["configuracoes"]["opcoes_ela_fez"].remove(sel_ela); save_all(db); st.rerun()
 
+    st.markdown("### 📥 Importar WhatsApp")
+    with st.container(border=True):
+        # O limite de tamanho é o server.maxUploadSize do Streamlit (200 MB por padrão). O UploadedFile fica
+        # inteiro na RAM do servidor; a leitura em si guarda só o mês corrente.
+        arq_zap = st.file_uploader("Export da conversa (.txt):", type=["txt"], key="up_zap")
+        fuso_zap = st.selectbox("Fuso do celular que exportou:", list(range(-12, 15)), index=9, format_func=lambda h: f"UTC{h:+d}")
+        if arq_zap:
+            estado = st.session_state.get("import_zap")
+            if not estado or (estado["nome"], estado["tamanho"], estado["fuso"]) != (arq_zap.name, arq_zap.size, fuso_zap):
+                estado = novo_estado_whatsapp(arq_zap.name, arq_zap.size, fuso_zap)
+                st.session_state["import_zap"] = estado
+            if estado["offset"]: st.caption(f"Importação interrompida em {estado['offset'] * 100 // max(estado['tamanho'], 1)}% — continua de onde parou.")
+            if st.button("Importar Conversa"):
+                barra = st.progress(estado["offset"] / max(estado["tamanho"], 1), text="Lendo export...")
+                try: n_dias, n_msgs = importar_whatsapp(arq_zap, estado, barra)
+                except Exception as e:
+                    # Volta ao último checkpoint consistente; o próximo clique continua dali
+                    st.session_state["import_zap"] = restaurar_estado_whatsapp(estado); st.error(f"Erro na importação: {e}")
+                else:
+                    st.session_state.pop("import_zap", None)
+                    if n_msgs: st.success(f"{n_msgs} mensagens importadas em {n_dias} dias!")
+                    else: st.info("Nenhuma mensagem nova para importar.")
+
     st.markdown("### 🔔 Preferências")
     with st.container(border=True):
         notif = st.toggle("Notificações", value=db["config"].get("notificacoes", True))